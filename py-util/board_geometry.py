@@ -0,0 +1,57 @@
+import re
+
+import numpy as np
+
+_CORNER_RE = re.compile(r'\(?\s*(-?\d+)\s*,\s*(-?\d+)\s*\)?')
+
+def parse_corners(corner_strings):
+    """
+    Parse corner coordinates from command line arguments.
+
+    One precompiled regex fullmatch per corner replaces the old
+    strip/split/int dance and tolerates both '(x, y)' and bare 'x,y' forms,
+    while still rejecting each malformed argument individually — a bad
+    corner can never borrow digits from its neighbors.
+
+    Args:
+        corner_strings (list): List of strings, one per corner
+
+    Returns:
+        list: List of (x, y) tuples
+    """
+    corners = []
+    for corner_str in corner_strings:
+        match = _CORNER_RE.fullmatch(corner_str.strip())
+        if match is None:
+            raise ValueError(f"Invalid corner format: {corner_str}. Expected format: x,y")
+        corners.append((int(match.group(1)), int(match.group(2))))
+    return corners
+
+_order_points_cache = {}
+
+def order_points(pts):
+    """
+    Order four corner points as [top-left, top-right, bottom-right, bottom-left].
+
+    The corners are sorted by angle around their centroid, which gives a
+    consistent clockwise winding (in image coordinates, y down) for any
+    convex quadrilateral — including boards rotated near 45 degrees, where
+    sum/diff argmin heuristics tie and pick the same corner twice. The cycle
+    is then rotated to start at the corner with the smallest x+y sum, the
+    one closest to the image origin. Results are memoized per corner set,
+    since the same corners are ordered by several consumers (mask
+    construction, visualization, batch runs).
+    """
+    key = tuple(tuple(p) for p in pts)
+    cached = _order_points_cache.get(key)
+    if cached is not None:
+        return cached
+
+    arr = np.asarray(pts, dtype=np.float32)
+    centroid = arr.mean(axis=0)
+    angles = np.arctan2(arr[:, 1] - centroid[1], arr[:, 0] - centroid[0])
+    cycle = np.argsort(angles)
+    start = arr[cycle].sum(axis=1).argmin()
+    ordered = [tuple(arr[i]) for i in np.roll(cycle, -start)]
+    _order_points_cache[key] = ordered
+    return ordered
@@ -3,6 +3,204 @@ import sys
 import json
 import os
 import time
+import hashlib
+import shutil
+import threading
+import mmap
+import asyncio
+from collections import deque
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+RENDER_CACHE_DIR = '.render_cache'
+
+def run_streamed(command, timeout=300, cwd=None, tail_lines=200, stdin=None):
+    """
+    Run a command while draining its stderr into a bounded buffer.
+
+    String commands run through the shell (needed for npx resolution);
+    argv lists are exec'd directly, skipping the shell fork and its
+    re-parsing/quoting of multi-KB command lines.
+
+    subprocess.run(capture_output=True) holds the entire output in memory and
+    decodes every line, but Remotion and ffmpeg emit megabytes of progress
+    output that is only ever read when something goes wrong. Streaming into a
+    bounded deque keeps the memory footprint flat while preserving the most
+    recent lines for error reporting, and lets the timeout kill the process
+    without waiting on full pipes.
+
+    Args:
+        command (str or list): Shell command string or argv list to run.
+        timeout (int): Seconds before the process is killed.
+        cwd (str, optional): Working directory for the command.
+        tail_lines (int): Number of trailing stderr lines to keep.
+        stdin: Passed through to Popen (e.g. another process's stdout pipe).
+
+    Returns:
+        tuple: (returncode, stderr_tail) — returncode is None on timeout.
+    """
+    # On Windows, keep child processes from flashing a console window when
+    # the Tauri sidecar launches us without one.
+    creationflags = getattr(subprocess, 'CREATE_NO_WINDOW', 0)
+    proc = subprocess.Popen(
+        command,
+        shell=isinstance(command, str),
+        cwd=cwd,
+        stdin=stdin,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        bufsize=1,
+        creationflags=creationflags
+    )
+    tail = deque(maxlen=tail_lines)
+
+    def _drain(stream):
+        for line in stream:
+            tail.append(line.rstrip('\n'))
+        stream.close()
+
+    drainer = threading.Thread(target=_drain, args=(proc.stderr,), daemon=True)
+    drainer.start()
+
+    try:
+        proc.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+        drainer.join(timeout=5)
+        return None, '\n'.join(tail)
+
+    drainer.join(timeout=5)
+    return proc.returncode, '\n'.join(tail)
+
+# Cache for the ffmpeg encoder probe so we only spawn ffmpeg once per process.
+_available_encoders = None
+
+def get_available_encoders():
+    """
+    Probe ffmpeg for the set of available video encoder names.
+
+    The result is cached for the lifetime of the process since the set of
+    compiled-in encoders cannot change between calls.
+
+    Returns:
+        set: Names of available video encoders (empty set if the probe fails).
+    """
+    global _available_encoders
+    if _available_encoders is not None:
+        return _available_encoders
+
+    encoders = set()
+    try:
+        result = subprocess.run(
+            ["ffmpeg", "-hide_banner", "-encoders"],
+            capture_output=True,
+            text=True,
+            timeout=15
+        )
+        for line in result.stdout.splitlines():
+            parts = line.split()
+            # Encoder lines look like " V....D h264_nvenc   NVIDIA NVENC ..."
+            if len(parts) >= 2 and parts[0].startswith('V'):
+                encoders.add(parts[1])
+    except Exception as e:
+        print(f"Warning: could not probe ffmpeg encoders: {e}")
+    _available_encoders = encoders
+    return _available_encoders
+
+def select_encoder(preferred='h264_nvenc'):
+    """
+    Pick a video encoder, preferring hardware encoders when available.
+
+    Args:
+        preferred (str): Desired encoder name ('h264_nvenc', 'h264_vaapi',
+                         'h264_qsv' or 'libx264').
+
+    Returns:
+        str: The preferred encoder if ffmpeg supports it, otherwise 'libx264'.
+    """
+    if preferred == 'libx264':
+        return 'libx264'
+    available = get_available_encoders()
+    if preferred in available:
+        return preferred
+    print(f"Encoder '{preferred}' not available, falling back to libx264")
+    return 'libx264'
+
+def get_render_cache_key(export_data):
+    """
+    Compute a cache key for the rendered animation.
+
+    The Remotion composition (ChessComponent.tsx / Root.tsx) renders from
+    the game content — moves, positions, evaluations — plus framePerMove
+    and boardSize, with timePerMove setting the fps. Hashing exactly those
+    fields means identical games reuse the cache even when the detected
+    timestamps differ, and any edit that changes the rendered frames misses
+    it. The timestamps themselves only drive the overlay placement, not the
+    render.
+
+    Args:
+        export_data (dict): Parsed export.json contents.
+
+    Returns:
+        str: Short hex digest identifying this render.
+    """
+    payload = json.dumps(
+        {
+            'moves': export_data.get('moves', []),
+            'positions': export_data.get('positions', []),
+            'evaluations': export_data.get('evaluations', []),
+            'framePerMove': export_data.get('framePerMove', 0),
+            'boardSize': export_data.get('boardSize', 0),
+            'timePerMove': export_data.get('timePerMove', 0.2)
+        },
+        sort_keys=True
+    ).encode()
+    return hashlib.blake2b(payload).hexdigest()[:16]
+
+def render_chess_animation_cached(export_data, output_file='chess-animation.mp4'):
+    """
+    Render the chess animation, reusing a cached copy when the same move
+    sequence has been rendered before.
+
+    A cache hit skips the entire Remotion (Node + Chromium + ffmpeg) round
+    trip, which is the single heaviest step of the pipeline.
+
+    Args:
+        export_data (dict): Parsed export.json contents.
+        output_file (str): Where the animation should end up.
+
+    Returns:
+        dict: Result of the rendering operation with success status and output.
+    """
+    cache_key = get_render_cache_key(export_data)
+    cache_path = os.path.join(RENDER_CACHE_DIR, f'{cache_key}.mp4')
+
+    if os.path.exists(cache_path):
+        print(f"Using cached chess animation: {cache_path}")
+        shutil.copy(cache_path, output_file)
+        return {
+            'success': True,
+            'output': f'Reused cached render {cache_path}',
+            'error': None
+        }
+
+    result = render_chess_animation()
+    if result['success']:
+        try:
+            os.makedirs(RENDER_CACHE_DIR, exist_ok=True)
+            shutil.copy(output_file, cache_path)
+            print(f"Cached chess animation as {cache_path}")
+        except Exception as e:
+            # A failed cache write only costs us the next render.
+            print(f"Warning: could not cache rendered animation: {e}")
+    return result
 
 def render_chess_animation():
     """
@@ -21,44 +219,36 @@ def render_chess_animation():
         print("Starting chess animation rendering...")
         print(f"Working directory: {root_dir}")
         print(f"Command: {command}")
-        
-        # Run command in shell to find 'npx'
-        result = subprocess.run(
-            command, 
-            cwd=root_dir, 
-            shell=True, 
-            check=True,
-            capture_output=True,
-            text=True,
-            timeout=300  # 5 minute timeout
-        )
-        
-        print("Chess animation rendered successfully.")
-        return {
-            'success': True,
-            'output': result.stdout,
-            'error': result.stderr if result.stderr else None
-        }
-        
-    except subprocess.CalledProcessError as e:
-        error_msg = f"Rendering failed with return code {e.returncode}"
-        print(error_msg)
-        if e.stdout:
-            print("STDOUT:", e.stdout)
-        if e.stderr:
-            print("STDERR:", e.stderr)
-        return {
-            'success': False,
-            'output': e.stdout if e.stdout else None,
-            'error': f"{error_msg}\nSTDERR: {e.stderr}\nSTDOUT: {e.stdout}"
-        }
-    except subprocess.TimeoutExpired:
-        error_msg = "Rendering timed out after 5 minutes"
+
+        # Run command in shell to find 'npx'; stderr is streamed into a
+        # bounded buffer rather than accumulated in memory.
+        return_code, log_tail = run_streamed(command, timeout=300, cwd=root_dir)
+
+        if return_code == 0:
+            print("Chess animation rendered successfully.")
+            return {
+                'success': True,
+                'output': log_tail if log_tail else None,
+                'error': None
+            }
+
+        if return_code is None:
+            error_msg = "Rendering timed out after 5 minutes"
+            print(error_msg)
+            return {
+                'success': False,
+                'output': None,
+                'error': error_msg
+            }
+
+        error_msg = f"Rendering failed with return code {return_code}"
         print(error_msg)
+        if log_tail:
+            print("LOG TAIL:", log_tail)
         return {
             'success': False,
             'output': None,
-            'error': error_msg
+            'error': f"{error_msg}\n{log_tail}"
         }
     except Exception as e:
         error_msg = f"Unexpected error during rendering: {str(e)}"
@@ -69,7 +259,7 @@ def render_chess_animation():
             'error': error_msg
         }
 
-def get_multiple_overlay_command(overlay_segs, bg_segs, xy_offset=None, background_file="cac.mp4", overlay_file="buoi.mp4", output_file="output.mp4"):
+def get_multiple_overlay_command(overlay_segs, bg_segs, xy_offset=None, background_file="cac.mp4", overlay_file="buoi.mp4", output_file="output.mp4", encoder='h264_nvenc', hwaccel='auto'):
     """
     Generate a single ffmpeg command to apply multiple overlays sequentially at a fixed position.
 
@@ -85,9 +275,20 @@ def get_multiple_overlay_command(overlay_segs, bg_segs, xy_offset=None, backgrou
         background_file (str): Path to the background video.
         overlay_file (str): Path to the overlay video.
         output_file (str): Path for the output video.
+        encoder (str): Preferred video encoder ('h264_nvenc', 'h264_vaapi',
+                       'h264_qsv' or 'libx264'). Hardware encoders are used
+                       when ffmpeg supports them, otherwise libx264.
+        hwaccel (str, optional): Hardware decode for the background input.
+                                 'nvidia' decodes it with NVDEC/CUVID and
+                                 downloads the frames ahead of the overlay
+                                 filter. 'auto' (default) enables NVDEC
+                                 whenever the NVENC encoder is available —
+                                 they ship on the same GPUs — so the full
+                                 VRAM pipeline engages without callers
+                                 plumbing a flag. None keeps CPU decode.
 
     Returns:
-        String command for ffmpeg.exe
+        list: Argv list for ffmpeg (run without a shell).
     """
     if len(overlay_segs) != len(bg_segs):
         raise ValueError("The number of overlay segments must match the number of background segments.")
@@ -101,97 +302,165 @@ def get_multiple_overlay_command(overlay_segs, bg_segs, xy_offset=None, backgrou
     
     x_pos, y_pos = xy_offset
 
-    # --- 1. Build the Input File List ---
-    input_cmds = [f'-i {background_file}']
-    for seg in overlay_segs:
-        start, end = seg
-        duration = end - start
-        input_cmds.append(f'-ss {start} -t {duration} -i {overlay_file}')
-    
-    full_input_str = ' '.join(input_cmds)
-
-    # --- 2. Build the Filter Complex Chain ---
-    filter_complex_parts = []
-    last_video_stream = "[0:v]"  # Start with the background video stream
-
-    # Iterate through each overlay operation. The xy position is now fixed from outside the loop.
-    for i, (overlay_seg, bg_seg) in enumerate(zip(overlay_segs, bg_segs), start=1):
+    encoder = select_encoder(encoder)
+    if hwaccel == 'auto':
+        hwaccel = 'nvidia' if encoder == 'h264_nvenc' else None
+
+    # --- 1. Lay the clips out on the overlay track ---
+    # Clips sit back to back, so each one starts where the previous ended.
+    # Consecutive bg segments overlap by design (segment N starts
+    # timePerMove before segment N-1 ends), so each clip's slot is cut off
+    # at the next segment's start — otherwise every animation would begin
+    # timePerMove late. When moves land closer than 2x timePerMove the slot
+    # can be shorter than the animation itself; the clip is clamped to its
+    # slot so it cannot overrun and shift every later overlay out of sync.
+    num_overlays = len(overlay_segs)
+    clip_plans = []  # (clip_duration, lead_in, freeze_duration) per overlay
+    clip_end = 0  # End time of the previous padded clip on the overlay track
+    for k, (overlay_seg, bg_seg) in enumerate(zip(overlay_segs, bg_segs)):
         overlay_start, overlay_end = overlay_seg
         bg_start, bg_end = bg_seg
 
-        overlay_duration = overlay_end - overlay_start
-        bg_overlay_duration = bg_end - bg_start
-
-        current_overlay_stream = f"[{i}:v]"
-        processed_overlay_stream = f"[processed_overlay_{i}]"
-        output_stream_label = f"[v_out_{i}]"
-
-        # --- Sub-filter for the current overlay (tpad, setpts) ---
-        overlay_sub_filters = []
-        freeze_duration = bg_overlay_duration - overlay_duration
+        slot_end = min(bg_end, bg_segs[k + 1][0]) if k + 1 < num_overlays else bg_end
+        # Every clip keeps at least one frame of room even for degenerate
+        # timestamp spacing, since ffmpeg rejects a non-positive -t.
+        slot_length = max(round(slot_end - max(clip_end, bg_start), 3), 0.04)
+        clip_duration = round(min(overlay_end - overlay_start, slot_length), 3)
+        lead_in = max(0, round(bg_start - clip_end, 3))
+        freeze_duration = round(slot_length - clip_duration, 3)
+
+        clip_plans.append((clip_duration, lead_in, freeze_duration))
+        clip_end = slot_end
+
+    # --- 2. Build the Input File List ---
+    input_args = []
+    if encoder == 'h264_vaapi':
+        input_args += ['-vaapi_device', '/dev/dri/renderD128']
+    if hwaccel == 'nvidia':
+        # Background decode on NVDEC; CPU H.264 decode of the background is
+        # otherwise the single-threaded bottleneck of the filter graph.
+        input_args += ['-hwaccel', 'cuda', '-hwaccel_output_format', 'cuda', '-c:v', 'h264_cuvid']
+    input_args += ['-i', background_file]
+    for seg, (clip_duration, _, _) in zip(overlay_segs, clip_plans):
+        input_args += ['-ss', str(seg[0]), '-t', str(clip_duration), '-i', overlay_file]
+
+    # --- 3. Build the Filter Complex Chain ---
+    # Instead of chaining one overlay filter per move (each of which evaluates
+    # its enable expression for every output frame, so cost grows with
+    # N_overlays * N_frames), pad every overlay clip to its scheduled slot,
+    # concat them into a single continuous overlay track, and composite that
+    # track with ONE overlay filter. Lead-in and freeze padding clone the
+    # first/last frame so the board position stays visible between moves.
+    filter_complex_parts = []
+    padded_streams = []
+
+    for i, (clip_duration, lead_in, freeze_duration) in enumerate(clip_plans, start=1):
+        source_stream = f"[{i}:v]"
+        pad_filters = ['setpts=PTS-STARTPTS']
+        tpad_args = []
+        if lead_in > 0.001:
+            tpad_args.append(f'start_duration={lead_in}:start_mode=clone')
         if freeze_duration > 0.001:
-            tpad_filter = f'tpad=stop_mode=clone:stop_duration={freeze_duration}'
-            overlay_sub_filters.append(tpad_filter)
-        
-        setpts_filter = f'setpts=PTS+{bg_start}/TB'
-        overlay_sub_filters.append(setpts_filter)
+            tpad_args.append(f'stop_duration={freeze_duration}:stop_mode=clone')
+        if tpad_args:
+            pad_filters.append(f'tpad={":".join(tpad_args)}')
 
-        filter_complex_parts.append(
-            f'{current_overlay_stream}{",".join(overlay_sub_filters)}{processed_overlay_stream}'
-        )
+        padded_stream = f"[pad_{i}]"
+        filter_complex_parts.append(f'{source_stream}{",".join(pad_filters)}{padded_stream}')
+        padded_streams.append(padded_stream)
 
-        # --- Overlay filter using the single x_pos and y_pos ---
-        overlay_filter = (
-            f'{last_video_stream}{processed_overlay_stream}'
-            f'overlay={x_pos}:{y_pos}:enable=\'between(t,{bg_start},{bg_end})\''
-            f'{output_stream_label}'
-        )
-        filter_complex_parts.append(overlay_filter)
-        
-        last_video_stream = output_stream_label
+    filter_complex_parts.append(
+        f'{"".join(padded_streams)}concat=n={len(padded_streams)}:v=1:a=0[ov]'
+    )
+
+    background_stream = "[0:v]"
+    overlay_stream = "[ov]"
+    overlay_filter = "overlay"
+    if hwaccel == 'nvidia' and encoder == 'h264_nvenc':
+        # Composite entirely on the GPU: the NVDEC-decoded background stays in
+        # VRAM, the concatenated overlay track is uploaded once, and
+        # overlay_cuda hands CUDA frames straight to NVENC — no CPU<->GPU
+        # bounce per output frame.
+        filter_complex_parts.append('[ov]hwupload_cuda[ov_hw]')
+        overlay_stream = "[ov_hw]"
+        overlay_filter = "overlay_cuda"
+    elif hwaccel == 'nvidia':
+        # The CPU overlay filter cannot consume CUDA surfaces, so the decoded
+        # background is brought back to system memory first.
+        filter_complex_parts.append('[0:v]hwdownload,format=nv12[bg]')
+        background_stream = "[bg]"
+
+    # One enable window spanning all segments keeps the baseline behavior —
+    # no overlay before the first move or after the last segment ends (the
+    # concat track's cloned lead-in and the filter's eof_action=repeat would
+    # otherwise pin the board on screen for the whole video). A single
+    # between() per output frame, so the cost stays O(1) in overlay count.
+    last_video_stream = "[v_out]"
+    filter_complex_parts.append(
+        f"{background_stream}{overlay_stream}{overlay_filter}={x_pos}:{y_pos}:shortest=0"
+        f":enable='between(t,{bg_segs[0][0]},{bg_segs[-1][1]})'{last_video_stream}"
+    )
 
-    full_filter_complex = f'"{";".join(filter_complex_parts)}"'
+    # VAAPI encoders consume GPU surfaces, so the composited CPU frames must be
+    # converted and uploaded at the end of the graph.
+    if encoder == 'h264_vaapi':
+        filter_complex_parts.append(f'{last_video_stream}format=nv12,hwupload[v_hw]')
+        last_video_stream = '[v_hw]'
+
+    # No shell is involved anymore, so the graph needs no outer quoting.
+    full_filter_complex = ';'.join(filter_complex_parts)
+
+    # --- 4. Assemble the Final Command ---
+    if encoder == 'h264_nvenc':
+        encoder_args = ['-c:v', 'h264_nvenc', '-preset', 'p4', '-b:v', '8M']
+    elif encoder == 'h264_vaapi':
+        encoder_args = ['-c:v', 'h264_vaapi', '-b:v', '8M']
+    elif encoder == 'h264_qsv':
+        encoder_args = ['-c:v', 'h264_qsv', '-b:v', '8M']
+    else:
+        # CPU fallback: let x264 use every core and trade size for speed —
+        # ffmpeg's default 'medium' preset is 3-5x slower than 'ultrafast'
+        # and the quality difference is irrelevant for a chess overlay.
+        encoder_args = ['-c:v', 'libx264', '-threads', '0', '-preset', 'ultrafast', '-tune', 'fastdecode']
 
-    # --- 3. Assemble the Final Command ---
     command = (
-        f'ffmpeg.exe {full_input_str} '
-        f'-filter_complex {full_filter_complex} '
-        f'-map "{last_video_stream}" '
-        f'-map 0:a? '
-        f'-c:a copy '
-        f'-y {output_file}'
+        # -loglevel error -stats cuts ffmpeg's stderr chatter at the source
+        # while keeping progress and any real errors.
+        ['ffmpeg', '-loglevel', 'error', '-stats']
+        + input_args
+        + ['-filter_threads', '0', '-filter_complex_threads', '0',
+           '-filter_complex', full_filter_complex,
+           '-map', last_video_stream,
+           '-map', '0:a?',
+           '-c:a', 'copy']
+        + encoder_args
+        + ['-y', output_file]
     )
-    
+
     return command
 
 def execute_ffmpeg_command(command):
     try:
         print(f"Executing ffmpeg in working directory: {os.getcwd()}")
-        print(f"Generated Command:\n{command}\n")
-        result = subprocess.run(
-            command,
-            shell=True,
-            capture_output=True,
-            text=True,
-            timeout=300  # 5 minute timeout
-        )
-        return { 
-            'success': result.returncode == 0, 
-            'output': result.stdout, 
-            'error': result.stderr, 
-            'return_code': result.returncode 
-        }
-    except subprocess.TimeoutExpired:
-        return { 
-            'success': False, 
-            'error': 'FFmpeg command timed out after 5 minutes', 
-            'return_code': -1 
+        print(f"Generated Command:\n{' '.join(command)}\n")
+        return_code, log_tail = run_streamed(command, timeout=300)
+        if return_code is None:
+            return {
+                'success': False,
+                'error': 'FFmpeg command timed out after 5 minutes',
+                'return_code': -1
+            }
+        return {
+            'success': return_code == 0,
+            'output': None,
+            'error': log_tail,
+            'return_code': return_code
         }
     except FileNotFoundError:
-        return { 
-            'success': False, 
-            'error': 'ffmpeg.exe not found in PATH or current directory', 
-            'return_code': -1 
+        return {
+            'success': False,
+            'error': 'ffmpeg not found in PATH or current directory',
+            'return_code': -1
         }
     except Exception as e:
         return { 
@@ -200,20 +469,110 @@ def execute_ffmpeg_command(command):
             'return_code': -1 
         }
 
+async def execute_ffmpeg_command_async(command, timeout=300, tail_lines=200):
+    """
+    Async variant of execute_ffmpeg_command for running encodes concurrently.
+
+    Awaiting the subprocess instead of blocking on it lets several
+    independent ffmpeg jobs overlap; use execute_many to run a batch.
+
+    Args:
+        command (list): ffmpeg argv list.
+        timeout (int): Seconds before the process is killed.
+        tail_lines (int): Number of trailing stderr lines to keep.
+
+    Returns:
+        dict: Same result shape as execute_ffmpeg_command.
+    """
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *command,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE
+        )
+
+        async def _drain(stream):
+            tail = deque(maxlen=tail_lines)
+            async for line in stream:
+                tail.append(line.decode(errors='replace').rstrip('\n'))
+            return tail
+
+        try:
+            tail, _ = await asyncio.wait_for(
+                asyncio.gather(_drain(proc.stderr), proc.wait()),
+                timeout=timeout
+            )
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            return {
+                'success': False,
+                'error': f'FFmpeg command timed out after {timeout} seconds',
+                'return_code': -1
+            }
+        return {
+            'success': proc.returncode == 0,
+            'output': None,
+            'error': '\n'.join(tail),
+            'return_code': proc.returncode
+        }
+    except FileNotFoundError:
+        return {
+            'success': False,
+            'error': 'ffmpeg not found in PATH or current directory',
+            'return_code': -1
+        }
+
+async def execute_many(commands, max_concurrency=None):
+    """
+    Run several ffmpeg commands concurrently with bounded parallelism.
+
+    Args:
+        commands (list): ffmpeg argv lists.
+        max_concurrency (int, optional): Concurrent process cap. Defaults to
+                                         the CPU count for software encodes;
+                                         pass 2-4 when targeting NVENC, which
+                                         limits concurrent sessions per GPU.
+
+    Returns:
+        list: execute_ffmpeg_command-style result dicts, in input order.
+    """
+    if max_concurrency is None:
+        max_concurrency = os.cpu_count() or 4
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _run(command):
+        async with semaphore:
+            return await execute_ffmpeg_command_async(command)
+
+    return list(await asyncio.gather(*(_run(c) for c in commands)))
+
 def load_export_data():
     remotion_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'remotion'))
     export_json_path = os.path.join(remotion_dir, 'export.json')
 
     try:
-        with open(export_json_path, 'r', encoding='utf-8') as f:
-            export_data = json.load(f)
-            
+        with open(export_json_path, 'rb') as f:
+            if orjson is not None:
+                # Parse straight out of the page cache: mmap skips the
+                # user-space read copy and orjson's C parser is several
+                # times faster than the stdlib tokenizer.
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                try:
+                    export_data = orjson.loads(mm)
+                finally:
+                    mm.close()
+            else:
+                export_data = json.load(f)
+
         print(f"Loaded export.json successfully from {export_json_path}")
         return export_data
     except FileNotFoundError:
         print(f"Could not find export.json at {export_json_path}")
         return None
-    except json.JSONDecodeError as e:
+    except ValueError as e:
+        # Covers json.JSONDecodeError, orjson.JSONDecodeError and an
+        # empty-file mmap alike.
         print(f"Error decoding export.json: {e}")
         return None
 
@@ -227,22 +586,22 @@ def process_overlay_data(export_data):
             print("No timestamps found in export data")
             return None
 
-        overlay_segs = [[round(i*timePerMove, 3), round((i+1)*timePerMove, 3)] for i in range(numberOfMoves)]
-        
-        # Make a copy of timestamps to avoid modifying the original
-        timestamps_copy = timestamps.copy()
-        timestamps_copy.append(7)  # Add end time
-        
-        bg_segs = [[round(timestamps_copy[i-1]-timePerMove, 3), timestamps_copy[i]] for i in range(1, numberOfMoves+1)]
-        bg_segs[0][0] = round(bg_segs[0][0]+timePerMove, 3)  # padding for initial position
-        
+        # Segment arithmetic is done as vectorized NumPy math: one round() call
+        # over the whole (N, 2) array instead of per-move Python arithmetic.
+        idx = np.arange(numberOfMoves)
+        overlay_segs = np.round(np.stack([idx * timePerMove, (idx + 1) * timePerMove], axis=1), 3)
+
+        ts = np.append(np.asarray(timestamps, dtype=np.float64), 7)  # Add end time
+        bg_segs = np.round(np.stack([ts[:-1] - timePerMove, ts[1:]], axis=1), 3)
+        bg_segs[0, 0] = round(bg_segs[0, 0] + timePerMove, 3)  # padding for initial position
+
         x_offset = export_data.get('x_offset', 0)
         y_offset = export_data.get('y_offset', 0)
         xy_offset = [x_offset, y_offset]
 
         print(f"Processed overlay data: {numberOfMoves} moves")
-        print(f"Overlay segments: {overlay_segs}")
-        print(f"Background segments: {bg_segs}")
+        print(f"Overlay segments: {overlay_segs.tolist()}")
+        print(f"Background segments: {bg_segs.tolist()}")
         print(f"XY Offset: {xy_offset}")
 
         return overlay_segs, bg_segs, xy_offset
@@ -260,9 +619,9 @@ def main():
         print("Failed to load export data. Aborting.")
         return {"success": False, "error": "Failed to load export.json"}
 
-    # Step 2: Render chess animation
+    # Step 2: Render chess animation (cached by move sequence)
     print("\n--- Step 2: Rendering chess animation ---")
-    render_result = render_chess_animation()
+    render_result = render_chess_animation_cached(export_data)
     if not render_result['success']:
         print("Failed to render chess animation. Aborting.")
         return {
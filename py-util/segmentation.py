@@ -1,81 +1,99 @@
-import cv2
 import numpy as np
-import os
 import json
 import argparse
 import sys
 
+from board_geometry import order_points, parse_corners
+
+SQUARE_SIZE = 1000
+BOARD_SIZE = 8 * SQUARE_SIZE
+
+def _perspective_matrix(src_points, dst_points):
+    """
+    Solve the 3x3 homography that maps src_points onto dst_points.
+
+    Direct-linear-transform formulation of cv2.getPerspectiveTransform: with
+    h22 fixed to 1, the four point pairs give an 8x8 linear system in the
+    remaining entries. Doing the solve in NumPy keeps cv2 (and its ~100ms+
+    shared-library load) out of this CLI's imports entirely.
+    """
+    src = np.asarray(src_points, dtype=np.float64)
+    dst = np.asarray(dst_points, dtype=np.float64)
+    x, y = src[:, 0], src[:, 1]
+    u, v = dst[:, 0], dst[:, 1]
+    zeros = np.zeros(4)
+    ones = np.ones(4)
+
+    A = np.empty((8, 8))
+    A[0::2] = np.stack([x, y, ones, zeros, zeros, zeros, -u * x, -u * y], axis=1)
+    A[1::2] = np.stack([zeros, zeros, zeros, x, y, ones, -v * x, -v * y], axis=1)
+    b = np.empty(8)
+    b[0::2] = u
+    b[1::2] = v
+
+    return np.append(np.linalg.solve(A, b), 1.0).reshape(3, 3)
+
+def _board_vertex_lattice():
+    """Board-space coordinates of the 9x9 grid vertices, as an (81, 2) array."""
+    # Adjacent squares share corners, so the board has only 81 distinct
+    # vertices — warping those and indexing the grid afterwards does ~3x
+    # less transform work than warping all 256 per-square corners.
+    coords = np.arange(9, dtype=np.float64) * SQUARE_SIZE
+    xs, ys = np.meshgrid(coords, coords)
+    return np.ascontiguousarray(np.stack([xs, ys], axis=-1).reshape(-1, 2))
+
+# The board-space lattice never varies (SQUARE_SIZE is fixed), so the vertex
+# set, its homogeneous lift, and the warp output buffer are built once at
+# import time; each call then only pays for the matmul itself.
+_BOARD_VERTICES = _board_vertex_lattice()
+_POINTS_H = np.concatenate([_BOARD_VERTICES.T, np.ones((1, _BOARD_VERTICES.shape[0]))])
+_WARP_BUF = np.empty_like(_POINTS_H)
+
 def chessboard_segmentation(corners):
     """Process corner points and generate all chess square coordinates in one go."""
     if corners is None or len(corners) != 4:
         raise ValueError("You must select exactly 4 corners first")
     
-    corners = sorted(corners, key=lambda x: x[1])
-    top_pts = sorted(corners[:2], key=lambda x: x[0])
-    bottom_pts = sorted(corners[2:], key=lambda x: x[0])
-    ordered_corners = [top_pts[0], top_pts[1], bottom_pts[1], bottom_pts[0]]
-    
-    square_size = 1000
-    corners_array = np.array(ordered_corners, dtype=np.float32)
-    board_size = 8 * square_size
+    corners_array = np.asarray(order_points(corners), dtype=np.float32)
+
     dst_points = np.array([
         [0, 0],                      # top-left
-        [board_size, 0],             # top-right
-        [board_size, board_size],    # bottom-right
-        [0, board_size]              # bottom-left
+        [BOARD_SIZE, 0],             # top-right
+        [BOARD_SIZE, BOARD_SIZE],    # bottom-right
+        [0, BOARD_SIZE]              # bottom-left
     ], dtype=np.float32)
     
-    perspective_matrix = cv2.getPerspectiveTransform(corners_array, dst_points)
-    inverse_matrix = cv2.invert(perspective_matrix)[1]
+    # Only the board->image direction is ever applied, so solve for it
+    # directly by swapping the point sets instead of solving image->board
+    # and then inverting the result.
+    inverse_matrix = _perspective_matrix(dst_points, corners_array)
     
-    # Generate all chess squares
+    # Warp the 81 distinct grid vertices with the homography applied directly
+    # in NumPy: lift to homogeneous coordinates, one 3x3 matmul against the
+    # precomputed vertex set, divide by w. Same math as
+    # cv2.perspectiveTransform without its per-call argument handling and
+    # (N, 1, 2) reshape dance; the matmul writes into the module-level
+    # buffer so steady-state calls allocate nothing for the warp.
+    warped = np.matmul(inverse_matrix, _POINTS_H, out=_WARP_BUF)
+    warped_xy = (warped[:2] / warped[2]).T
+
+    # Generate all chess squares: each corner class is a shifted window into
+    # the warped 9x9 grid, converted with one C-level tolist() per class.
+    # Rounding to nearest (rather than truncating toward zero) keeps corners
+    # near pixel boundaries on the right pixel.
+    grid_xy = np.rint(warped_xy).astype(np.int32).reshape(9, 9, 2)
     squares = {
-        "top-left": [],
-        "top-right": [],
-        "bottom-right": [],
-        "bottom-left": []
+        "top-left": grid_xy[:8, :8].reshape(-1, 2).tolist(),
+        "top-right": grid_xy[:8, 1:].reshape(-1, 2).tolist(),
+        "bottom-right": grid_xy[1:, 1:].reshape(-1, 2).tolist(),
+        "bottom-left": grid_xy[1:, :8].reshape(-1, 2).tolist()
     }
-    
-    for row in range(8):
-        for col in range(8):
-            min_x = col * square_size
-            min_y = row * square_size 
-            
-            board_corners = [
-                (min_x, min_y),                                    # top-left
-                (min_x + square_size, min_y),                     # top-right
-                (min_x + square_size, min_y + square_size),       # bottom-right
-                (min_x, min_y + square_size)                      # bottom-left
-            ]
-            
-            image_corners = []
-            for point in board_corners:
-                point_array = np.array([[point[0], point[1]]], dtype=np.float32)
-                warped_point = cv2.perspectiveTransform(point_array.reshape(-1, 1, 2), inverse_matrix)
-                wx, wy = warped_point[0][0]
-                image_corners.append((int(wx), int(wy)))
-            
-            squares["top-left"].append(list(image_corners[0]))
-            squares["top-right"].append(list(image_corners[1]))
-            squares["bottom-right"].append(list(image_corners[2]))
-            squares["bottom-left"].append(list(image_corners[3]))
-    
-    print(json.dumps(squares))
 
-def parse_corners(corner_strings):
-    """Parse corner coordinates from command line arguments."""
-    corners = []
-    for corner_str in corner_strings:
-        try:
-            # Remove parentheses and split by comma
-            coords = corner_str.strip('()').split(',')
-            if len(coords) != 2:
-                raise ValueError(f"Invalid corner format: {corner_str}")
-            x, y = int(coords[0].strip()), int(coords[1].strip())
-            corners.append((x, y))
-        except ValueError as e:
-            raise ValueError(f"Error parsing corner '{corner_str}': {e}")
-    return corners
+    # Stream straight to stdout instead of materializing the full JSON
+    # string first; compact separators also trim the payload the Tauri
+    # side has to read back.
+    json.dump(squares, sys.stdout, separators=(',', ':'))
+    sys.stdout.write('\n')
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Chess board segmentation with perspective correction')